@@ -6,9 +6,27 @@ This example shows how to integrate LLM Guard into a simple chatbot or LLM appli
 Perfect for developers who want to add safety checks to their existing applications.
 """
 
-from llm_guard import SafetyGuard
+import sys
 import time
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Dict, Any
+
+
+# Simulated LLM replies, checked in order against the lowercased input
+CANNED_RESPONSES = (
+    ("weather", "I don't have access to real-time weather data, but you can check a weather service for current conditions."),
+    ("help", "I'm here to help! You can ask me questions about various topics, and I'll do my best to provide helpful information."),
+    ("hello", "Hello! How can I assist you today?"),
+    ("hi", "Hello! How can I assist you today?"),
+)
+
+# Constant status-line prefixes, written with sys.stdout.write instead of
+# being re-formatted by print() on every turn
+_CHECKING = '🔍 Checking user input: "'
+_INPUT_BLOCKED = "❌ Input blocked: "
+_PII_REDACTED = "🔒 PII redacted in input\n"
+_INPUT_APPROVED = "✅ Input approved ("
+_RESPONSE_BLOCKED = "❌ Response blocked: "
 
 
 class SafeChatbot:
@@ -21,11 +39,18 @@ class SafeChatbot:
     
     def __init__(self, enable_logging: bool = True):
         """Initialize the safe chatbot with LLM Guard."""
+        from llm_guard import SafetyGuard
+        
         self.guard = SafetyGuard(
             log_file="chatbot_safety.log" if enable_logging else None,
             metrics_enabled=True
         )
-        self.conversation_history = []
+        # Recent turns only; session statistics are kept as running counters
+        self.conversation_history = deque(maxlen=1000)
+        self._turns = 0
+        self._input_blocks = 0
+        self._response_blocks = 0
+        self._total_latency_ns = 0
         
     def process_user_input(self, user_input: str) -> Dict[str, Any]:
         """
@@ -37,24 +62,25 @@ class SafeChatbot:
         Returns:
             Dictionary containing safety check results and processed input
         """
-        print(f"🔍 Checking user input: \"{user_input[:50]}{'...' if len(user_input) > 50 else ''}\"")
+        preview = user_input if len(user_input) <= 50 else user_input[:50] + "..."
+        sys.stdout.write(_CHECKING + preview + '"\n')
         
         # Check input safety
-        start_time = time.time()
+        t0 = time.perf_counter_ns()
         safety_result = self.guard.check(user_input, return_details=True)
-        check_time = (time.time() - start_time) * 1000
+        check_ns = time.perf_counter_ns() - t0
         
         result = {
             "original_input": user_input,
             "is_safe": safety_result.is_safe,
-            "safety_reason": getattr(safety_result, 'reason', None),
-            "check_latency_ms": round(check_time, 2),
+            "safety_reason": safety_result.reason,
+            "check_latency_ns": check_ns,
             "processed_input": None,
             "response": None
         }
         
         if not safety_result.is_safe:
-            print(f"❌ Input blocked: {safety_result.reason}")
+            sys.stdout.write(_INPUT_BLOCKED + safety_result.reason + "\n")
             result["response"] = "I can't process that request due to safety concerns."
             return result
         
@@ -62,10 +88,8 @@ class SafeChatbot:
         processed_input = self.guard.redact_pii(user_input)
         result["processed_input"] = processed_input
         
-        if processed_input != user_input:
-            print(f"🔒 PII redacted in input")
-        
-        print(f"✅ Input approved ({check_time:.1f}ms)")
+        status = _PII_REDACTED if processed_input != user_input else ""
+        sys.stdout.write(f"{status}{_INPUT_APPROVED}{check_ns / 1e6:.1f}ms)\n")
         return result
     
     def generate_response(self, safe_input: str) -> str:
@@ -75,14 +99,12 @@ class SafeChatbot:
         In a real application, this would call your actual LLM.
         """
         # Simulate different responses based on input
-        if "weather" in safe_input.lower():
-            return "I don't have access to real-time weather data, but you can check a weather service for current conditions."
-        elif "help" in safe_input.lower():
-            return "I'm here to help! You can ask me questions about various topics, and I'll do my best to provide helpful information."
-        elif "hello" in safe_input.lower() or "hi" in safe_input.lower():
-            return "Hello! How can I assist you today?"
-        else:
-            return f"Thank you for your message. I understand you're asking about: {safe_input[:100]}{'...' if len(safe_input) > 100 else ''}"
+        lowered = safe_input.lower()
+        for keyword, response in CANNED_RESPONSES:
+            if keyword in lowered:
+                return response
+        
+        return f"Thank you for your message. I understand you're asking about: {safe_input[:100]}{'...' if len(safe_input) > 100 else ''}"
     
     def check_response_safety(self, response: str) -> Dict[str, Any]:
         """
@@ -94,20 +116,20 @@ class SafeChatbot:
         Returns:
             Dictionary containing safety check results
         """
-        start_time = time.time()
+        t0 = time.perf_counter_ns()
         safety_result = self.guard.check(response, return_details=True)
-        check_time = (time.time() - start_time) * 1000
+        check_ns = time.perf_counter_ns() - t0
         
         result = {
             "original_response": response,
             "is_safe": safety_result.is_safe,
-            "safety_reason": getattr(safety_result, 'reason', None),
-            "check_latency_ms": round(check_time, 2),
+            "safety_reason": safety_result.reason,
+            "check_latency_ns": check_ns,
             "final_response": response if safety_result.is_safe else "I apologize, but I can't provide that response."
         }
         
         if not safety_result.is_safe:
-            print(f"❌ Response blocked: {safety_result.reason}")
+            sys.stdout.write(_RESPONSE_BLOCKED + safety_result.reason + "\n")
         
         return result
     
@@ -124,7 +146,18 @@ class SafeChatbot:
         # Step 1: Check input safety
         input_result = self.process_user_input(user_input)
         
+        self._turns += 1
+        self._total_latency_ns += input_result["check_latency_ns"]
+        
         if not input_result["is_safe"]:
+            self._input_blocks += 1
+            self.conversation_history.append({
+                "user_input": user_input,
+                "input_safe": False,
+                "response": input_result["response"],
+                "response_safe": None,
+                "total_latency_ns": input_result["check_latency_ns"]
+            })
             return input_result["response"]
         
         # Step 2: Generate response (simulate LLM call)
@@ -133,26 +166,30 @@ class SafeChatbot:
         # Step 3: Check response safety
         response_result = self.check_response_safety(response)
         
-        # Store conversation for metrics
+        self._total_latency_ns += response_result["check_latency_ns"]
+        if not response_result["is_safe"]:
+            self._response_blocks += 1
+        
+        # Store conversation for inspection
         self.conversation_history.append({
             "user_input": user_input,
-            "input_safe": input_result["is_safe"],
+            "input_safe": True,
             "response": response_result["final_response"],
             "response_safe": response_result["is_safe"],
-            "total_latency_ms": input_result["check_latency_ms"] + response_result["check_latency_ms"]
+            "total_latency_ns": input_result["check_latency_ns"] + response_result["check_latency_ns"]
         })
         
         return response_result["final_response"]
     
     def get_safety_stats(self) -> Dict[str, Any]:
         """Get safety statistics for the conversation session."""
-        if not self.conversation_history:
+        total_conversations = self._turns
+        if not total_conversations:
             return {"message": "No conversations yet"}
         
-        total_conversations = len(self.conversation_history)
-        input_blocks = sum(1 for conv in self.conversation_history if not conv["input_safe"])
-        response_blocks = sum(1 for conv in self.conversation_history if not conv["response_safe"])
-        avg_latency = sum(conv["total_latency_ms"] for conv in self.conversation_history) / total_conversations
+        input_blocks = self._input_blocks
+        response_blocks = self._response_blocks
+        avg_latency = self._total_latency_ns / total_conversations / 1e6
         
         return {
             "total_conversations": total_conversations,
@@ -6,8 +6,14 @@ This example showcases all major features including safety checks,
 PII detection and redaction, prompt injection detection, and performance metrics.
 """
 
-from llm_guard import SafetyGuard
+from __future__ import annotations
+
+import sys
 import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from llm_guard import SafetyGuard
 
 
 def print_header(title: str) -> None:
@@ -54,24 +60,27 @@ def run_safety_checks(guard: SafetyGuard) -> None:
 
     print_header("🧪 Running Comprehensive Safety Checks")
 
-    for i, test in enumerate(test_cases, 1):
-        print(f"\n{i}. {test['category']}")
-        print(f"   Description: {test['description']}")
-        print(f"   Input: \"{test['text'][:50]}{'...' if len(test['text']) > 50 else ''}\"")
+    # Check the whole batch at once; metrics and logs are updated once per batch
+    results = guard.batch_check([test['text'] for test in test_cases], return_details=True)
 
-        start_time = time.time()
-        result = guard.check(test['text'], return_details=True)
-        latency = (time.time() - start_time) * 1000
+    lines = []
+    for i, (test, result) in enumerate(zip(test_cases, results), 1):
+        lines.append(f"\n{i}. {test['category']}")
+        lines.append(f"   Description: {test['description']}")
+        lines.append(f"   Input: \"{test['text'][:50]}{'...' if len(test['text']) > 50 else ''}\"")
 
         status = "✅ SAFE" if result.is_safe else "❌ BLOCKED"
-        print(f"   Result: {status}")
-        print(f"   Latency: {latency:.1f}ms")
+        lines.append(f"   Result: {status}")
+        lines.append(f"   Latency: {result.latency_ms:.1f}ms")
 
         if result.reason:
-            print(f"   Reason: {result.reason}")
+            lines.append(f"   Reason: {result.reason}")
 
-        if hasattr(result, 'confidence'):
-            print(f"   Confidence: {result.confidence:.2f}")
+        if result.max_score is not None:
+            lines.append(f"   Max score: {result.max_score:.2f}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def demonstrate_pii_redaction(guard: SafetyGuard) -> None:
@@ -101,12 +110,12 @@ def demonstrate_pii_redaction(guard: SafetyGuard) -> None:
         print(f"\n{i}. {example['description']}")
         print(f"   Original: {example['text']}")
 
-        start_time = time.time()
+        t0 = time.perf_counter_ns()
         redacted = guard.redact_pii(example['text'])
-        latency = (time.time() - start_time) * 1000
+        dt_ns = time.perf_counter_ns() - t0
 
         print(f"   Redacted: {redacted}")
-        print(f"   Latency: {latency:.1f}ms")
+        print(f"   Latency: {dt_ns / 1e6:.1f}ms")
 
 
 def demonstrate_custom_rules(guard: SafetyGuard) -> None:
@@ -134,11 +143,12 @@ def demonstrate_custom_rules(guard: SafetyGuard) -> None:
         "This is a normal business inquiry about pricing"
     ]
 
-    for i, text in enumerate(custom_test_cases, 1):
+    results = guard.batch_check(custom_test_cases, return_details=True)
+
+    for i, (text, result) in enumerate(zip(custom_test_cases, results), 1):
         print(f"\n{i}. Testing custom rules")
         print(f"   Input: {text}")
 
-        result = guard.check(text, return_details=True)
         status = "✅ SAFE" if result.is_safe else "❌ BLOCKED"
         print(f"   Result: {status}")
 
@@ -168,6 +178,9 @@ def main() -> None:
     """Main demonstration function."""
     print_header("🛡️ LLM Guard - Comprehensive Demo")
 
+    # Imported here so the banner appears before the validators load
+    from llm_guard import SafetyGuard
+
     # Initialize with comprehensive logging and metrics
     guard = SafetyGuard(
         log_file="comprehensive_demo.log",
@@ -180,6 +193,7 @@ def main() -> None:
     run_safety_checks(guard)
     demonstrate_pii_redaction(guard)
     demonstrate_custom_rules(guard)
+    guard.flush_logs()
     show_performance_metrics(guard)
 
     print_header("🎉 Demo Completed Successfully")
@@ -6,13 +6,18 @@ This example demonstrates how to create and use custom safety rules
 for domain-specific requirements and business logic.
 """
 
-from llm_guard import SafetyGuard
-import re
-from typing import List, Dict, Any
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from llm_guard import SafetyGuard
 
 
 def create_business_rules_guard() -> SafetyGuard:
     """Create a SafetyGuard instance with custom business rules."""
+    from llm_guard import SafetyGuard
     guard = SafetyGuard(log_file="custom_rules_demo.log")
     
     # Business-specific rules
@@ -50,6 +55,7 @@ def create_business_rules_guard() -> SafetyGuard:
 
 def create_content_moderation_guard() -> SafetyGuard:
     """Create a SafetyGuard for content moderation with custom rules."""
+    from llm_guard import SafetyGuard
     guard = SafetyGuard()
     
     # Content moderation rules
@@ -79,6 +85,7 @@ def create_content_moderation_guard() -> SafetyGuard:
 
 def create_educational_content_guard() -> SafetyGuard:
     """Create a SafetyGuard for educational content with age-appropriate rules."""
+    from llm_guard import SafetyGuard
     guard = SafetyGuard()
     
     # Educational content rules
@@ -122,19 +129,23 @@ def demonstrate_business_rules():
         "I heard RivalCorp has better features"
     ]
     
-    for i, text in enumerate(test_cases, 1):
-        print(f"\n{i}. Input: \"{text}\"")
-        result = guard.check(text, return_details=True)
+    results = guard.batch_check(test_cases, return_details=True)
+    
+    lines = []
+    for i, (text, result) in enumerate(zip(test_cases, results), 1):
+        lines.append(f"\n{i}. Input: \"{text}\"")
         
         if result.is_safe:
-            print("   ✅ APPROVED")
+            lines.append("   ✅ APPROVED")
         else:
-            print(f"   ❌ BLOCKED: {result.reason}")
+            lines.append(f"   ❌ BLOCKED: {result.reason}")
         
         # Check for flags (warnings that don't block)
-        if hasattr(result, 'flags') and result.flags:
-            for flag in result.flags:
-                print(f"   🚩 FLAG: {flag}")
+        for flag in result.flags:
+            lines.append(f"   🚩 FLAG: {flag}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def demonstrate_content_moderation():
@@ -152,14 +163,19 @@ def demonstrate_content_moderation():
         "This is helpful information for everyone"
     ]
     
-    for i, text in enumerate(test_cases, 1):
-        print(f"\n{i}. Content: \"{text}\"")
-        result = guard.check(text, return_details=True)
+    results = guard.batch_check(test_cases, return_details=True)
+    
+    lines = []
+    for i, (text, result) in enumerate(zip(test_cases, results), 1):
+        lines.append(f"\n{i}. Content: \"{text}\"")
         
         if result.is_safe:
-            print("   ✅ APPROVED")
+            lines.append("   ✅ APPROVED")
         else:
-            print(f"   ❌ BLOCKED: {result.reason}")
+            lines.append(f"   ❌ BLOCKED: {result.reason}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def demonstrate_educational_rules():
@@ -177,14 +193,19 @@ def demonstrate_educational_rules():
         "How does machine learning work?"
     ]
     
-    for i, text in enumerate(test_cases, 1):
-        print(f"\n{i}. Student Query: \"{text}\"")
-        result = guard.check(text, return_details=True)
+    results = guard.batch_check(test_cases, return_details=True)
+    
+    lines = []
+    for i, (text, result) in enumerate(zip(test_cases, results), 1):
+        lines.append(f"\n{i}. Student Query: \"{text}\"")
         
         if result.is_safe:
-            print("   ✅ APPROPRIATE")
+            lines.append("   ✅ APPROPRIATE")
         else:
-            print(f"   ❌ INAPPROPRIATE: {result.reason}")
+            lines.append(f"   ❌ INAPPROPRIATE: {result.reason}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def demonstrate_rule_priorities():
@@ -192,6 +213,7 @@ def demonstrate_rule_priorities():
     print("\n⚖️ Rule Priority Demo")
     print("=" * 50)
     
+    from llm_guard import SafetyGuard
     guard = SafetyGuard()
     
     # Add rules with different priorities
@@ -217,9 +239,10 @@ def demonstrate_rule_priorities():
         "Running test scenarios"  # Should be blocked by general rule
     ]
     
-    for i, text in enumerate(test_cases, 1):
+    results = guard.batch_check(test_cases, return_details=True)
+    
+    for i, (text, result) in enumerate(zip(test_cases, results), 1):
         print(f"\n{i}. Input: \"{text}\"")
-        result = guard.check(text, return_details=True)
         
         if result.is_safe:
             print(f"   ✅ ALLOWED: {result.reason}")
@@ -232,6 +255,7 @@ def demonstrate_dynamic_rules():
     print("\n🔄 Dynamic Rules Demo")
     print("=" * 50)
     
+    from llm_guard import SafetyGuard
     guard = SafetyGuard()
     test_text = "This contains a keyword"
     
@@ -57,6 +57,12 @@ setup(
             "sphinx-rtd-theme>=1.0",
             "sphinx-autodoc-typehints>=1.0",
         ],
+        "fast": [
+            "hyperscan>=0.2",
+            "blake3>=0.3",
+            "xxhash>=3.0",
+            "orjson>=3.0",
+        ],
         "ml": [
             "onnxruntime>=1.12",
             "transformers>=4.0",
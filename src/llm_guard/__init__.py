@@ -6,12 +6,15 @@ __version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
+import threading
+
 from .core.safety_guard import SafetyGuard, SafetyResult, SafetyMetrics
 
 __all__ = [
     "SafetyGuard",
     "SafetyResult", 
     "SafetyMetrics",
+    "get_default_guard",
 ]
 
 # Convenience function
@@ -23,3 +26,24 @@ def create_guard(**kwargs):
         guard = create_guard(thresholds={'toxicity': 0.8})
     """
     return SafetyGuard(**kwargs)
+
+
+_default_guard = None
+_default_guard_lock = threading.Lock()
+
+def get_default_guard(**kwargs):
+    """
+    Return a process-wide SafetyGuard, creating it on first use
+    
+    Keyword arguments only take effect on the call that creates the guard;
+    later calls return the existing instance unchanged.
+    
+    Example:
+        guard = get_default_guard()
+    """
+    global _default_guard
+    if _default_guard is None:
+        with _default_guard_lock:
+            if _default_guard is None:
+                _default_guard = SafetyGuard(**kwargs)
+    return _default_guard
@@ -4,11 +4,14 @@
 import argparse
 import sys
 import json
-from typing import Optional
-from pathlib import Path
 
 from llm_guard import SafetyGuard, __version__
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def main():
     """Main CLI entry point"""
@@ -68,7 +71,10 @@ def check_text(guard: SafetyGuard, args):
         if args.detailed:
             output["scores"] = result.scores
             output["details"] = result.details
-        print(json.dumps(output, indent=2))
+        if orjson is not None:
+            print(orjson.dumps(output, option=orjson.OPT_INDENT_2).decode())
+        else:
+            print(json.dumps(output, indent=2))
     else:
         if result.is_safe:
             print("✅ SAFE")
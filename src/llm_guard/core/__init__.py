@@ -1,7 +1,6 @@
 """Core safety checking functionality"""
 
 from .safety_guard import SafetyGuard, SafetyResult, SafetyMetrics
-from .validators import ToxicityValidator, PIIValidator, PromptInjectionValidator
 
 __all__ = [
     "SafetyGuard",
@@ -11,3 +10,11 @@ __all__ = [
     "PIIValidator", 
     "PromptInjectionValidator",
 ]
+
+
+def __getattr__(name):
+    # Validators are loaded lazily, see .validators
+    if name in ("ToxicityValidator", "PIIValidator", "PromptInjectionValidator"):
+        from . import validators
+        return getattr(validators, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,62 @@
+# llm_guard/core/executor.py
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+_THREAD_NAME_PREFIX = 'llm_guard'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by every SafetyGuard and validator, created on first use.
+    
+    Guards are often built per request; a pool each would start and join
+    its own threads every time.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                _executor = ThreadPoolExecutor(thread_name_prefix=_THREAD_NAME_PREFIX)
+    return _executor
+
+
+def _in_pool_thread() -> bool:
+    return threading.current_thread().name.startswith(_THREAD_NAME_PREFIX + '_')
+
+
+class BatchValidationMixin:
+    """``validate_batch`` for validators that define ``validate(text)``"""
+    
+    def validate_batch(
+        self,
+        texts: List[str],
+        max_workers: Optional[int] = None
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Validate several texts in one call, e.g. from a single worker thread
+        
+        With ``max_workers`` above 1 the texts are split into that many runs
+        on the shared pool. That only pays off where matching runs without
+        the GIL (free-threaded builds); validators are safe to share between
+        threads. Calls made from a pool thread stay in line, as waiting there
+        on other pool jobs could deadlock the pool.
+        """
+        if max_workers and max_workers > 1 and len(texts) > 1 and not _in_pool_thread():
+            size = -(-len(texts) // max_workers)
+            pool = get_executor()
+            futures = [pool.submit(_validate_all, self, texts[i:i + size]) for i in range(0, len(texts), size)]
+            return [outcome for future in futures for outcome in future.result()]
+        return _validate_all(self, texts)
+
+
+def _validate_all(validator: Any, texts: List[str]) -> List[Tuple[float, Dict[str, Any]]]:
+    return [validator.validate(text) for text in texts]
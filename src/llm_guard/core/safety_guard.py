@@ -1,20 +1,115 @@
 # llm_guard/core/safety_guard.py
 
+from __future__ import annotations
+
+import os
+import sys
+import array
 import time
+import threading
+import hashlib
+import importlib
 import logging
-from typing import Dict, List, Optional, Union, Any
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union, Any
+from dataclasses import dataclass, fields
+from collections import OrderedDict
 import json
-from pathlib import Path
+import re
+
+from .executor import get_executor
+from .scanner import PatternScanner, encode
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+
+# Cache keys only need collision resistance, not a cryptographic hash, so
+# the fastest available 128-bit digest is used.
+if xxhash is not None:
+    def _fingerprint(data: bytes) -> bytes:
+        return xxhash.xxh3_128_digest(data)
+elif blake3 is not None:
+    def _fingerprint(data: bytes) -> bytes:
+        return blake3(data).digest(16)
+else:
+    def _fingerprint(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """File handler that batches log records in a write buffer.
+    
+    ``logging.FileHandler`` flushes after every record, costing one write()
+    per check. Records here are only written once the buffer fills, on
+    ``flush_buffer()`` or when the handler is closed at interpreter exit.
+    """
+    
+    def __init__(self, filename: str, buffer_size: int = 128 * 1024, encoding: str = 'utf-8'):
+        self.buffer_size = buffer_size
+        super().__init__(filename, mode='a', encoding=encoding)
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size, encoding=self.encoding)
+    
+    def flush(self):
+        # Called by emit() after every record; defer to flush_buffer().
+        pass
+    
+    def flush_buffer(self):
+        self.acquire()
+        try:
+            if self.stream and hasattr(self.stream, 'flush'):
+                self.stream.flush()
+        finally:
+            self.release()
+
 
-# Import validators (we'll create these next)
-from .validators.toxicity import ToxicityValidator
-from .validators.pii import PIIValidator
-from .validators.prompt_injection import PromptInjectionValidator
+# Validator classes by name. Their modules are imported when a guard first
+# asks for them, so importing llm_guard does not pay for validators (and
+# their dependencies) that are never run.
+_VALIDATORS = {
+    'toxicity': ('.validators.toxicity', 'ToxicityValidator'),
+    'pii': ('.validators.pii', 'PIIValidator'),
+    'prompt_injection': ('.validators.prompt_injection', 'PromptInjectionValidator'),
+}
 
 
-@dataclass
+def _load_validator(name: str) -> type:
+    module_name, class_name = _VALIDATORS[name]
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+def _slotted_dataclass(cls):
+    """``@dataclass`` with ``__slots__``, also on Python < 3.10.
+    
+    Older versions lack ``dataclass(slots=True)``, so the class is rebuilt
+    with the field names as slots, which is what ``slots=True`` does.
+    """
+    if sys.version_info >= (3, 10):
+        return dataclass(slots=True)(cls)
+    
+    cls = dataclass(cls)
+    names = tuple(field.name for field in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in names}
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted_dataclass
 class SafetyResult:
     """Result of a safety check"""
     is_safe: bool
@@ -22,19 +117,47 @@ class SafetyResult:
     scores: Dict[str, float] = None
     details: Dict[str, Any] = None
     latency_ms: float = 0
+    max_score: Optional[float] = None
+    flags: Tuple[str, ...] = ()
     
     def __repr__(self):
         return f"SafetyResult(is_safe={self.is_safe}, reason='{self.reason}')"
 
 
-@dataclass
+@_slotted_dataclass
 class SafetyMetrics:
-    """Metrics for monitoring"""
+    """Metrics for monitoring
+    
+    Per-validator counters are ``array('q')`` buffers indexed like
+    ``validator_names``; requested checks that name no validator (e.g.
+    ``'jailbreak'``) are counted in ``other_check_counts``. ``check_counts``
+    and ``block_counts`` present them as dicts.
+    """
     total_checks: int = 0
     blocked_count: int = 0
     total_latency_ms: float = 0
-    check_counts: Dict[str, int] = None
-    block_counts: Dict[str, int] = None
+    validator_names: Tuple[str, ...] = ()
+    check_array: Any = None
+    block_array: Any = None
+    other_check_counts: Dict[str, int] = None
+    
+    def __post_init__(self):
+        if self.check_array is None:
+            self.check_array = array.array('q', bytes(8 * len(self.validator_names)))
+        if self.block_array is None:
+            self.block_array = array.array('q', bytes(8 * len(self.validator_names)))
+        if self.other_check_counts is None:
+            self.other_check_counts = {}
+    
+    @property
+    def check_counts(self) -> Dict[str, int]:
+        counts = {name: n for name, n in zip(self.validator_names, self.check_array) if n}
+        counts.update(self.other_check_counts)
+        return counts
+    
+    @property
+    def block_counts(self) -> Dict[str, int]:
+        return {name: n for name, n in zip(self.validator_names, self.block_array) if n}
     
     @property
     def block_rate(self) -> float:
@@ -46,7 +169,11 @@ class SafetyMetrics:
 
 
 class SafetyGuard:
-    """Main interface for LLM safety checks"""
+    """Main interface for LLM safety checks
+    
+    ``check`` may be called from several threads at once; the shared cache
+    and metrics are only touched while holding an internal lock.
+    """
     
     DEFAULT_THRESHOLDS = {
         'toxicity': 0.7,
@@ -55,6 +182,14 @@ class SafetyGuard:
         'jailbreak': 0.85
     }
     
+    # Texts up to this many characters are validated in line rather than
+    # fanned out to the executor
+    PARALLEL_MIN_LENGTH = 2048
+    
+    # Characters of preceding context filter_stream rescans with each chunk,
+    # enough to complete a PII match that straddles the chunk boundary
+    STREAM_OVERLAP = 64
+    
     def __init__(
         self,
         thresholds: Optional[Dict[str, float]] = None,
@@ -67,48 +202,56 @@ class SafetyGuard:
     ):
         self.thresholds = {**self.DEFAULT_THRESHOLDS, **(thresholds or {})}
         self.cache_enabled = cache_enabled
-        self.cache = {} if cache_enabled else None
+        self.cache = OrderedDict() if cache_enabled else None
         self.cache_size = cache_size
         self.metrics_enabled = metrics_enabled
-        self.metrics = SafetyMetrics(check_counts={}, block_counts={}) if metrics_enabled else None
         self.parallel_checks = parallel_checks
         
         self.logger = self._setup_logging(log_file)
         self.validators = self._init_validators(validators)
-        self.executor = ThreadPoolExecutor(max_workers=len(self.validators)) if parallel_checks else None
+        self._validator_index = {name: i for i, name in enumerate(self.validators)}
+        self.metrics = SafetyMetrics(validator_names=tuple(self.validators)) if metrics_enabled else None
+        self.executor = get_executor() if parallel_checks else None
         self.custom_rules = []
+        self._rule_scanners = {}
+        self._rules_version = 0
+        self._plans = {}
+        self._outcomes = OrderedDict()
+        self._lock = threading.Lock()
         
-        self.logger.info(f"SafetyGuard initialized with validators: {list(self.validators.keys())}")
+        self.logger.info("SafetyGuard initialized with validators: %s", list(self.validators.keys()))
     
     def _setup_logging(self, log_file: Optional[str]) -> logging.Logger:
+        # The logger is shared by every SafetyGuard, so handlers are only
+        # attached once rather than again for each new instance.
         logger = logging.getLogger('llm_guard')
         logger.setLevel(logging.INFO)
+        logger.propagate = False
         
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        if not any(type(handler) is logging.StreamHandler for handler in logger.handlers):
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(formatter)
+            logger.addHandler(console_handler)
         
         if log_file:
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            path = os.path.abspath(log_file)
+            if not any(getattr(handler, 'baseFilename', None) == path for handler in logger.handlers):
+                file_handler = BufferedFileHandler(log_file)
+                file_handler.setFormatter(formatter)
+                logger.addHandler(file_handler)
         
         return logger
     
     def _init_validators(self, validator_names: Optional[List[str]] = None) -> Dict:
-        all_validators = {
-            'toxicity': ToxicityValidator(),
-            'pii': PIIValidator(),
-            'prompt_injection': PromptInjectionValidator(),
+        return {
+            name: _load_validator(name)()
+            for name in _VALIDATORS
+            if not validator_names or name in validator_names
         }
-        
-        if validator_names:
-            return {k: v for k, v in all_validators.items() if k in validator_names}
-        return all_validators
     
     def check(
         self,
@@ -116,72 +259,150 @@ class SafetyGuard:
         checks: Optional[List[str]] = None,
         return_details: bool = False
     ) -> SafetyResult:
-        start_time = time.time()
+        # Empty text cannot trip a validator; custom rules and the details
+        # report still go through the full path. Results are mutable, so
+        # each caller gets its own.
+        if not text and not return_details and not self.custom_rules:
+            result = SafetyResult(is_safe=True, max_score=0.0)
+            if self.metrics_enabled:
+                self._update_metrics([result], checks or list(self.validators))
+            return result
+        
+        # Hashing the text is only worth it when there is a cache to consult
+        cache_enabled = self.cache_enabled
+        fingerprint = None
+        if cache_enabled:
+            fingerprint = _fingerprint(encode(text))
+            cache_key = self._get_cache_key(text, checks, return_details, fingerprint)
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                self.logger.debug("Cache hit for text: %s...", text[:50])
+                return cached
+        
+        validators_to_run = checks or list(self.validators)
+        result = self._evaluate(text, validators_to_run, return_details, fingerprint)
+        
+        if self.metrics_enabled:
+            self._update_metrics([result], validators_to_run)
+        
+        if cache_enabled:
+            self._update_cache(cache_key, result)
+        
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Safety check completed: is_safe=%s, latency=%.1fms, text='%s...'",
+                result.is_safe, result.latency_ms, text[:50]
+            )
+        
+        return result
+    
+    def _evaluate(
+        self,
+        text: str,
+        validators_to_run: List[str],
+        return_details: bool,
+        fingerprint: Optional[bytes] = None
+    ) -> SafetyResult:
+        start_ns = time.perf_counter_ns()
+        validators, rule_scan = self._get_plan(validators_to_run)
         
-        cache_key = self._get_cache_key(text, checks)
-        if self.cache_enabled and cache_key in self.cache:
-            self.logger.debug(f"Cache hit for text: {text[:50]}...")
-            return self.cache[cache_key]
+        # Thread handoff costs more than the validators themselves on short
+        # texts, so those run in line.
+        if self.parallel_checks and len(validators) > 1 and len(text) > self.PARALLEL_MIN_LENGTH:
+            futures = [
+                (name, threshold, self.executor.submit(self._validate, name, validator, text, fingerprint))
+                for name, validator, threshold in validators
+            ]
+            outcomes = [(name, threshold, future.result()) for name, threshold, future in futures]
+        else:
+            outcomes = [
+                (name, threshold, self._validate(name, validator, text, fingerprint))
+                for name, validator, threshold in validators
+            ]
         
-        validators_to_run = checks or list(self.validators.keys())
+        return self._build_result(text, outcomes, rule_scan, return_details, start_ns)
+    
+    def _validate(
+        self,
+        name: str,
+        validator: Any,
+        text: str,
+        fingerprint: Optional[bytes] = None
+    ) -> Tuple[float, Dict[str, Any]]:
+        """Run one validator, reusing its outcome for recently seen text.
         
-        results = {}
+        Lets e.g. ``check`` followed by ``detect_prompt_injection`` on the same
+        prompt, or checks with different ``checks`` lists, share validator work
+        that the result cache cannot. ``fingerprint`` is the text's cache
+        fingerprint when the caller already has it.
+        """
+        if not self.cache_enabled:
+            return validator.validate(text)
+        
+        if fingerprint is None:
+            fingerprint = _fingerprint(encode(text))
+        key = (name, fingerprint)
+        outcome = self._outcomes.get(key)
+        if outcome is not None:
+            return outcome
+        
+        outcome = validator.validate(text)
+        self._outcomes[key] = outcome
+        while len(self._outcomes) > 256:
+            try:
+                self._outcomes.popitem(last=False)
+            except KeyError:
+                break
+        return outcome
+    
+    def _build_result(
+        self,
+        text: str,
+        outcomes: List[Tuple[str, float, Tuple[float, Dict[str, Any]]]],
+        rule_scan: Optional[tuple],
+        return_details: bool,
+        start_ns: int
+    ) -> SafetyResult:
+        # Per-validator score/detail dicts are only built when asked for
+        results = {} if return_details else None
         reasons = []
+        flags = []
         is_safe = True
+        max_score = None
         
-        if self.parallel_checks and len(validators_to_run) > 1:
-            futures = {}
-            for name in validators_to_run:
-                if name in self.validators:
-                    future = self.executor.submit(self.validators[name].validate, text)
-                    futures[name] = future
-            
-            for name, future in futures.items():
-                score, details = future.result()
+        for name, threshold, (score, details) in outcomes:
+            if results is not None:
                 results[name] = {'score': score, 'details': details}
-                
-                if score > self.thresholds.get(name, 0.5):
-                    is_safe = False
-                    reasons.append(f"{name}: {details.get('reason', 'Threshold exceeded')}")
-        else:
-            for name in validators_to_run:
-                if name in self.validators:
-                    score, details = self.validators[name].validate(text)
-                    results[name] = {'score': score, 'details': details}
-                    
-                    if score > self.thresholds.get(name, 0.5):
-                        is_safe = False
-                        reasons.append(f"{name}: {details.get('reason', 'Threshold exceeded')}")
-        
-        for rule in self.custom_rules:
-            if rule['pattern'].search(text):
+            if max_score is None or score > max_score:
+                max_score = score
+            
+            if score > threshold:
+                is_safe = False
+                reasons.append(f"{name}: {details.get('reason', 'Threshold exceeded')}")
+        
+        if rule_scan is not None:
+            scanner, rules = rule_scan
+            for index in sorted(scanner.scan(text, encode(text))):
+                rule = rules[index]
                 if rule['action'] == 'block':
                     is_safe = False
                     reasons.append(f"Custom rule: {rule['message']}")
-                results[f"custom_{rule['name']}"] = {'triggered': True}
+                elif rule['action'] == 'flag':
+                    flags.append(rule['message'])
+                if results is not None:
+                    results[f"custom_{rule['name']}"] = {'triggered': True}
         
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter_ns() - start_ns) * 1e-6
         
-        result = SafetyResult(
+        return SafetyResult(
             is_safe=is_safe,
             reason="; ".join(reasons) if reasons else None,
-            scores={k: v['score'] for k, v in results.items() if 'score' in v} if return_details else None,
-            details=results if return_details else None,
-            latency_ms=latency_ms
+            scores={name: score for name, _, (score, _) in outcomes} if return_details else None,
+            details=results,
+            latency_ms=latency_ms,
+            max_score=max_score,
+            flags=tuple(flags)
         )
-        
-        if self.metrics_enabled:
-            self._update_metrics(result, validators_to_run)
-        
-        if self.cache_enabled:
-            self._update_cache(cache_key, result)
-        
-        self.logger.info(
-            f"Safety check completed: is_safe={is_safe}, "
-            f"latency={latency_ms:.1f}ms, text='{text[:50]}...'"
-        )
-        
-        return result
     
     def is_safe(self, text: str, checks: Optional[List[str]] = None) -> bool:
         return self.check(text, checks).is_safe
@@ -193,25 +414,32 @@ class SafetyGuard:
         if 'pii' in self.validators:
             return self.validators['pii'].redact(text)
         else:
-            pii_validator = PIIValidator()
+            pii_validator = _load_validator('pii')()
             return pii_validator.redact(text)
     
     def detect_prompt_injection(self, text: str) -> tuple[bool, float]:
         if 'prompt_injection' in self.validators:
-            score, details = self.validators['prompt_injection'].validate(text)
+            score, details = self._validate('prompt_injection', self.validators['prompt_injection'], text)
             is_injection = score > self.thresholds.get('prompt_injection', 0.8)
             return is_injection, score
         return False, 0.0
     
+    def update_thresholds(self, thresholds: Dict[str, float]):
+        """Change validator thresholds.
+        
+        Same as updating ``self.thresholds`` directly; plans and cached
+        results are keyed on the current values either way.
+        """
+        self.thresholds.update(thresholds)
+    
     def add_custom_rule(
         self,
         name: str,
         pattern: Union[str, Any],
         action: str = "block",
-        message: str = "Custom rule triggered"
+        message: str = "Custom rule triggered",
+        replacement: Optional[str] = None
     ):
-        import re
-        
         if isinstance(pattern, str):
             pattern = re.compile(pattern, re.IGNORECASE)
         
@@ -219,26 +447,165 @@ class SafetyGuard:
             'name': name,
             'pattern': pattern,
             'action': action,
-            'message': message
+            'message': message,
+            'replacement': replacement if replacement is not None else f"[{name.upper()}]"
         })
+        self._rule_scanners = {}
+        self._rules_version += 1
+        
+        self.logger.info("Added custom rule: %s", name)
+    
+    def remove_custom_rule(self, name: str) -> bool:
+        remaining = [rule for rule in self.custom_rules if rule['name'] != name]
+        removed = len(remaining) != len(self.custom_rules)
+        
+        if removed:
+            self.custom_rules = remaining
+            self._rule_scanners = {}
+            self._rules_version += 1
+            self.logger.info("Removed custom rule: %s", name)
+        
+        return removed
+    
+    def redact_custom(self, text: str) -> str:
+        scanner, rules = self._get_rule_scanner('redact')
+        if not rules:
+            return text
+        
+        if scanner.combined is not None:
+            def expand(match):
+                # The rule alone matches the same span at this position; its
+                # match numbers groups as the replacement expects, so the
+                # replacement is a template just as in pattern.sub below.
+                rule = rules[int(match.lastgroup[4:])]
+                return rule['pattern'].match(text, match.start()).expand(rule['replacement'])
+            
+            return scanner.combined.sub(expand, text)
         
-        self.logger.info(f"Added custom rule: {name}")
+        for rule in rules:
+            text = rule['pattern'].sub(rule['replacement'], text)
+        return text
+    
+    def _get_rule_scanner(self, action: Optional[str] = None) -> tuple:
+        """A PatternScanner over the custom rules with ``action`` (every rule
+        when None), together with those rules.
+        
+        Built lazily and dropped whenever rules are added or removed.
+        """
+        entry = self._rule_scanners.get(action)
+        if entry is None:
+            rules = [rule for rule in self.custom_rules if action is None or rule['action'] == action]
+            entry = (PatternScanner([rule['pattern'] for rule in rules]), rules)
+            self._rule_scanners[action] = entry
+        return entry
+    
+    def _get_plan(self, validators_to_run: List[str]) -> tuple:
+        """Validators with their thresholds, and the custom-rule scanner, for
+        one set of checks.
+        
+        Resolved once per checks/rules/thresholds combination instead of on
+        every call; a new rules version or threshold value makes stale plans
+        unreachable.
+        """
+        key = (tuple(validators_to_run), self._config_key())
+        plan = self._plans.get(key)
+        if plan is None:
+            if len(self._plans) >= 32:
+                self._plans.clear()
+            validators = tuple(
+                (name, self.validators[name], self.thresholds.get(name, 0.5))
+                for name in validators_to_run if name in self.validators
+            )
+            # Every custom rule goes through one scanner whatever its action,
+            # so the text is scanned once per check.
+            rule_scan = self._get_rule_scanner() if self.custom_rules else None
+            plan = (validators, rule_scan)
+            self._plans[key] = plan
+        return plan
     
     def batch_check(
         self,
         texts: List[str],
         checks: Optional[List[str]] = None,
-        max_workers: int = 10
+        max_workers: int = 10,
+        return_details: bool = False
     ) -> List[SafetyResult]:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(self.check, text, checks) for text in texts]
-            return [future.result() for future in futures]
+        """Check many texts, updating metrics and logging once for the whole batch
+        
+        ``max_workers`` is kept for compatibility; validators run on the
+        shared executor, one job each.
+        """
+        validators_to_run = checks or list(self.validators)
+        results = [None] * len(texts)
+        
+        pending = {}
+        for i, text in enumerate(texts):
+            if not self.cache_enabled:
+                pending[i] = None
+                continue
+            cache_key = self._get_cache_key(text, checks, return_details)
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[i] = cache_key
+        
+        if not pending:
+            return results
+        
+        # One job per validator over the whole batch rather than one per text
+        pending_texts = [texts[i] for i in pending]
+        validators, rule_scan = self._get_plan(validators_to_run)
+        batch_start_ns = time.perf_counter_ns()
+        
+        if self.parallel_checks and len(validators) > 1:
+            futures = [
+                (name, self.executor.submit(validator.validate_batch, pending_texts))
+                for name, validator, _ in validators
+            ]
+            columns = [(name, future.result()) for name, future in futures]
+        else:
+            columns = [(name, validator.validate_batch(pending_texts)) for name, validator, _ in validators]
+        
+        # Validator time is shared out evenly; rule scans are timed per text
+        share_ns = (time.perf_counter_ns() - batch_start_ns) // len(pending_texts)
+        for j, i in enumerate(pending):
+            outcomes = [
+                (name, threshold, column[j])
+                for (name, column), (_, _, threshold) in zip(columns, validators)
+            ]
+            results[i] = self._build_result(texts[i], outcomes, rule_scan, return_details, time.perf_counter_ns() - share_ns)
+        
+        fresh = [results[i] for i in pending]
+        
+        if self.metrics_enabled:
+            self._update_metrics(fresh, validators_to_run)
+        
+        if self.cache_enabled:
+            for i, cache_key in pending.items():
+                self._update_cache(cache_key, results[i])
+        
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Batch safety check completed: checked=%d, blocked=%d, cached=%d, latency=%.1fms",
+                len(fresh), sum(1 for result in fresh if not result.is_safe),
+                len(texts) - len(fresh), sum(result.latency_ms for result in fresh)
+            )
+        self.flush_logs()
+        
+        return results
     
     def filter_stream(self, chunk: str, context: str = "") -> Optional[str]:
-        combined = context + chunk
+        # An empty chunk adds nothing that has not already been screened
+        if not chunk:
+            return chunk
+        
+        # The context was screened as it streamed in, so only its tail is
+        # rescanned; rechecking all of it made a stream quadratic.
+        window = context[-self.STREAM_OVERLAP:] + chunk
         
         fast_checks = ['pii', 'toxicity']
-        result = self.check(combined, checks=fast_checks)
+        result = self.check(window, checks=fast_checks)
         
         if result.is_safe:
             return chunk
@@ -248,6 +615,13 @@ class SafetyGuard:
                 return cleaned
             return None
     
+    def flush_logs(self):
+        for handler in self.logger.handlers:
+            if isinstance(handler, BufferedFileHandler):
+                handler.flush_buffer()
+            else:
+                handler.flush()
+    
     def get_metrics(self) -> Dict[str, Any]:
         if not self.metrics_enabled:
             return {}
@@ -264,31 +638,77 @@ class SafetyGuard:
     
     def reset_metrics(self):
         if self.metrics_enabled:
-            self.metrics = SafetyMetrics(check_counts={}, block_counts={})
+            with self._lock:
+                self.metrics = SafetyMetrics(validator_names=tuple(self.validators))
     
-    def _get_cache_key(self, text: str, checks: Optional[List[str]]) -> str:
-        import hashlib
+    def _get_cache_key(
+        self,
+        text: str,
+        checks: Optional[List[str]],
+        return_details: bool = False,
+        fingerprint: Optional[bytes] = None
+    ) -> tuple:
+        # The config key invalidates cached results whenever custom rules
+        # or thresholds change, without having to walk the cache.
+        if fingerprint is None:
+            fingerprint = _fingerprint(encode(text))
         checks_str = ",".join(sorted(checks)) if checks else "all"
-        return hashlib.md5(f"{text}:{checks_str}".encode()).hexdigest()
+        return (fingerprint, checks_str, return_details, self._config_key())
     
-    def _update_cache(self, key: str, result: SafetyResult):
-        if len(self.cache) >= self.cache_size:
-            first_key = next(iter(self.cache))
-            del self.cache[first_key]
-        
-        self.cache[key] = result
+    def _config_key(self) -> tuple:
+        # Thresholds are read by value, since callers may assign to
+        # ``self.thresholds`` directly rather than call update_thresholds.
+        return (self._rules_version, tuple(self.thresholds.items()))
     
-    def _update_metrics(self, result: SafetyResult, checks: List[str]):
-        self.metrics.total_checks += 1
-        self.metrics.total_latency_ms += result.latency_ms
-        
-        if not result.is_safe:
-            self.metrics.blocked_count += 1
+    def _get_cached(self, key: tuple) -> Optional[SafetyResult]:
+        # Hits move to the end, so eviction drops the least recently used
+        # result.
+        with self._lock:
+            result = self.cache.get(key)
+            if result is not None:
+                self.cache.move_to_end(key)
+        return result
+    
+    def _update_cache(self, key: tuple, result: SafetyResult):
+        with self._lock:
+            if len(self.cache) >= self.cache_size:
+                self.cache.popitem(last=False)
+            
+            self.cache[key] = result
+    
+    def _update_metrics(self, results: List[SafetyResult], checks: List[str]):
+        blocked = [result for result in results if not result.is_safe]
+        index = self._validator_index
+        checked = [index[check] for check in checks if check in index]
+        others = [check for check in checks if check not in index] if len(checked) < len(checks) else ()
+        blocking = [
+            index[name]
+            for result in blocked
+            for name in self._blocking_validators(result.reason)
+            if name in index
+        ]
         
-        for check in checks:
-            self.metrics.check_counts[check] = self.metrics.check_counts.get(check, 0) + 1
-            if not result.is_safe and check in (result.reason or ""):
-                self.metrics.block_counts[check] = self.metrics.block_counts.get(check, 0) + 1
+        with self._lock:
+            metrics = self.metrics
+            metrics.total_checks += len(results)
+            metrics.total_latency_ms += sum(result.latency_ms for result in results)
+            metrics.blocked_count += len(blocked)
+            
+            check_array, block_array = metrics.check_array, metrics.block_array
+            for i in checked:
+                check_array[i] += len(results)
+            other_counts = metrics.other_check_counts
+            for check in others:
+                other_counts[check] = other_counts.get(check, 0) + len(results)
+            for i in blocking:
+                block_array[i] += 1
+    
+    @staticmethod
+    def _blocking_validators(reason: Optional[str]) -> List[str]:
+        # Validator reasons read "name: message" and are joined with "; ".
+        # Matching the name exactly avoids counting e.g. a custom rule
+        # message that merely mentions a validator.
+        return [part.split(': ', 1)[0] for part in (reason or "").split('; ')]
     
     def save_config(self, path: str):
         config = {
@@ -299,32 +719,39 @@ class SafetyGuard:
                     'name': rule['name'],
                     'pattern': rule['pattern'].pattern,
                     'action': rule['action'],
-                    'message': rule['message']
+                    'message': rule['message'],
+                    'replacement': rule['replacement']
                 }
                 for rule in self.custom_rules
             ]
         }
         
-        with open(path, 'w') as f:
-            json.dump(config, f, indent=2)
+        if orjson is not None:
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, 'w') as f:
+                json.dump(config, f, indent=2)
     
     def load_config(self, path: str):
-        with open(path, 'r') as f:
-            config = json.load(f)
+        with open(path, 'rb') as f:
+            data = f.read()
+        config = orjson.loads(data) if orjson is not None else json.loads(data)
         
-        self.thresholds.update(config.get('thresholds', {}))
+        self.update_thresholds(config.get('thresholds', {}))
         
         for rule in config.get('custom_rules', []):
             self.add_custom_rule(
                 name=rule['name'],
                 pattern=rule['pattern'],
                 action=rule['action'],
-                message=rule['message']
+                message=rule['message'],
+                replacement=rule.get('replacement')
             )
     
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.executor:
-            self.executor.shutdown(wait=True)
+        # The executor is shared with other guards, so it stays running
+        self.flush_logs()
@@ -0,0 +1,535 @@
+# llm_guard/core/scanner.py
+
+import functools
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, FrozenSet, List, Optional, Set
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+HYPERSCAN_AVAILABLE = hyperscan is not None
+
+_BACKREF_RE = re.compile(r'\\[1-9]|\(\?P=')
+_INLINE_FLAGS = ((re.ASCII, 'a'), (re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+# ``re`` counts these separators as ``\s`` in str patterns; bytes patterns
+# and Hyperscan do not.
+_STR_ONLY_SPACE = re.compile('[\x1c-\x1f]')
+
+_ENCODED_MAX = 256
+_encoded = OrderedDict()
+
+
+def encode(text: str) -> bytes:
+    """Return ``text`` encoded as UTF-8, reusing recent encodings.
+
+    A single check hands the same string to the cache key, the custom rule
+    scan and the validators' scanners; remembering the last few encodings
+    by identity means it is only encoded once. Entries hold a reference to
+    the text, so its id cannot be reused while cached.
+    """
+    key = id(text)
+    entry = _encoded.get(key)
+    if entry is not None and entry[0] is text:
+        return entry[1]
+
+    data = text.encode('utf-8')
+    _encoded[key] = (text, data)
+    while len(_encoded) > _ENCODED_MAX:
+        try:
+            _encoded.popitem(last=False)
+        except KeyError:
+            break
+    return data
+
+
+def bytes_equivalent(text: str) -> bool:
+    """Whether patterns match ``text`` exactly as they match its UTF-8 bytes.
+
+    True for ASCII text without the separators ``\\x1c``-``\\x1f``, the only
+    ASCII characters that str and bytes patterns (and Hyperscan) classify
+    differently. Only such text may be scanned as bytes.
+    """
+    return text.isascii() and _STR_ONLY_SPACE.search(text) is None
+
+
+def combine_patterns(patterns: List[Any]) -> Optional[re.Pattern]:
+    """Join compiled patterns into one alternation of ``(?P<ruleN>...)`` branches.
+
+    Returns None when the patterns cannot be safely combined.
+    """
+    if not patterns:
+        return None
+    if not all(isinstance(p, re.Pattern) and isinstance(p.pattern, str) for p in patterns):
+        return None
+    # Group numbers shift once patterns are concatenated, so anything
+    # using backreferences is left to be matched on its own.
+    if any(_BACKREF_RE.search(p.pattern) for p in patterns):
+        return None
+
+    branches = []
+    for i, p in enumerate(patterns):
+        flags = ''.join(letter for flag, letter in _INLINE_FLAGS if p.flags & flag)
+        body = f"(?{flags}:{p.pattern})" if flags else p.pattern
+        branches.append(f"(?P<rule{i}>{body})")
+
+    try:
+        return re.compile("|".join(branches))
+    except re.error:
+        return None
+
+
+def required_literals(pattern: Any) -> Optional[FrozenSet[str]]:
+    r"""Literal strings of which at least one occurs in every match of ``pattern``.
+
+    Literals are lowercased for case-insensitive patterns, and a small
+    character class contributes its characters as one-character literals
+    (``\d`` becomes ``{'0', ..., '9'}``). The result holds for ASCII text,
+    and for any text when ``holds_for_unicode`` says so. Returns None when no such set can be derived, e.g. for patterns
+    built from broad classes like ``\w`` or that change case sensitivity
+    part-way through.
+    """
+    if not isinstance(pattern, re.Pattern) or not isinstance(pattern.pattern, str):
+        return None
+    return _pattern_literals(pattern)
+
+
+# Validators built repeatedly would otherwise parse the same patterns again
+@functools.lru_cache(maxsize=1024)
+def _pattern_literals(pattern: re.Pattern) -> Optional[FrozenSet[str]]:
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except (re.error, RecursionError):
+        return None
+    # The parser state is ``.state`` since Python 3.8 and ``.pattern`` before
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    ignore_case = bool(state.flags & re.IGNORECASE)
+    literals = _required_in_sequence(parsed, ignore_case)
+    return frozenset(literals) if literals is not None else None
+
+
+def _required_in_sequence(items, ignore_case: bool) -> Optional[Set[str]]:
+    # Every mandatory element of a sequence yields a candidate set; keep the
+    # most selective one (longest shortest literal, then fewest literals).
+    best = None
+    run = []
+
+    def consider(candidates):
+        nonlocal best
+        if candidates and (best is None or _selectivity(candidates) > _selectivity(best)):
+            best = candidates
+
+    for op, av in items:
+        if op is sre_parse.LITERAL and av < 128:
+            run.append(chr(av).lower() if ignore_case else chr(av))
+            continue
+
+        if run:
+            consider({''.join(run)})
+            run = []
+
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            if not (add_flags | del_flags) & re.IGNORECASE:
+                consider(_required_in_sequence(sub, ignore_case))
+        elif op is sre_parse.BRANCH:
+            alternatives = [_required_in_sequence(branch, ignore_case) for branch in av[1]]
+            if all(alternatives):
+                consider(set().union(*alternatives))
+        elif op in _REPEATS and av[0] >= 1:
+            consider(_required_in_sequence(av[2], ignore_case))
+        elif op is sre_parse.IN:
+            consider(_class_members(av, ignore_case))
+
+    if run:
+        consider({''.join(run)})
+    return best
+
+
+def _class_members(items, ignore_case: bool) -> Optional[Set[str]]:
+    chars = set()
+    for op, av in items:
+        if op is sre_parse.LITERAL and av < 128:
+            chars.add(chr(av))
+        elif op is sre_parse.RANGE and av[1] < 128:
+            chars.update(chr(c) for c in range(av[0], av[1] + 1))
+        elif op is sre_parse.CATEGORY and av is sre_parse.CATEGORY_DIGIT:
+            chars.update('0123456789')
+        else:
+            return None
+
+    if ignore_case:
+        chars = {c.lower() for c in chars}
+    return chars if len(chars) <= _MAX_CLASS_SIZE else None
+
+
+# Larger classes (e.g. [A-Za-z]) reject too little text to be worth checking.
+_MAX_CLASS_SIZE = 16
+
+# Case-insensitive ``re`` matches 'i' to 'ı' and 'İ', and 's' to 'ſ', none of
+# which ``str.lower()`` turns into the ASCII letter.
+_UNFOLDED_CASELESS = frozenset('is')
+
+
+def _selectivity(candidates: Set[str]) -> tuple:
+    return (min(len(c) for c in candidates), -len(candidates))
+
+
+def holds_for_unicode(literals: Set[str], ignore_case: bool) -> bool:
+    r"""Whether ``required_literals`` output also holds for non-ASCII text.
+
+    Single digits may stand for ``\d``, which matches other scripts' digits
+    as well, and a few ASCII letters have non-ASCII case variants that
+    lowercasing the text does not map back.
+    """
+    if any(len(literal) == 1 and literal.isdigit() for literal in literals):
+        return False
+    return not ignore_case or not any(_UNFOLDED_CASELESS.intersection(literal) for literal in literals)
+
+
+_REPEATS = tuple(
+    getattr(sre_parse, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_parse, name)
+)
+
+
+def hyperscan_expression(pattern: Any) -> Optional[bytes]:
+    r"""``pattern`` rewritten for Hyperscan from ``re``'s own parse of it.
+
+    Hyperscan reads some valid ``re`` syntax differently (``\Z``, ``{,n}``,
+    ``[[:alpha:]]``, ...), so the source is never handed over as-is. Only
+    constructs known to match the same on ``bytes_equivalent`` text are
+    translated: literals, classes, ``\d\w\s`` and their negations,
+    ``.``, groups without flag changes, alternation, repeats and the
+    ``^ $ \A \b`` anchors. Anything else returns None and stays on
+    ``re``.
+    """
+    if not isinstance(pattern, re.Pattern) or not isinstance(pattern.pattern, str):
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+        return _hyperscan_sequence(parsed).encode('ascii')
+    except (ValueError, re.error, RecursionError):
+        return None
+
+
+def _hyperscan_sequence(items) -> str:
+    return ''.join(_hyperscan_item(op, av) for op, av in items)
+
+
+def _hyperscan_item(op, av) -> str:
+    if op is sre_parse.LITERAL:
+        return _hyperscan_char(av)
+    if op is sre_parse.NOT_LITERAL:
+        return f"[^{_hyperscan_char(av)}]"
+    if op is sre_parse.ANY:
+        return '.'
+    if op is sre_parse.IN:
+        return _hyperscan_class(av)
+    if op is sre_parse.CATEGORY:
+        return _hyperscan_category(av)
+    if op is sre_parse.BRANCH:
+        return '(?:' + '|'.join(_hyperscan_sequence(branch) for branch in av[1]) + ')'
+    if op is sre_parse.SUBPATTERN:
+        _, add_flags, del_flags, sub = av
+        if add_flags or del_flags:
+            raise ValueError('scoped flags')
+        return f"(?:{_hyperscan_sequence(sub)})"
+    if op is sre_parse.MAX_REPEAT or op is sre_parse.MIN_REPEAT:
+        # Laziness does not change whether a pattern matches at all
+        low, high, sub = av
+        bound = f"{{{low},}}" if high == sre_parse.MAXREPEAT else f"{{{low},{high}}}"
+        return f"(?:{_hyperscan_sequence(sub)}){bound}"
+    if op is sre_parse.AT and av in _HYPERSCAN_ANCHORS:
+        return _HYPERSCAN_ANCHORS[av]
+    raise ValueError(f"unsupported construct {op}")
+
+
+def _hyperscan_char(code: int) -> str:
+    if code >= 128:
+        raise ValueError('non-ASCII literal')
+    return chr(code) if chr(code).isalnum() else f"\\x{code:02x}"
+
+
+def _hyperscan_class(items) -> str:
+    parts = []
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            parts.append('^')
+        elif op is sre_parse.LITERAL:
+            parts.append(_hyperscan_char(av))
+        elif op is sre_parse.RANGE:
+            parts.append(f"{_hyperscan_char(av[0])}-{_hyperscan_char(av[1])}")
+        elif op is sre_parse.CATEGORY:
+            parts.append(_hyperscan_category(av))
+        else:
+            raise ValueError(f"unsupported class item {op}")
+    return '[' + ''.join(parts) + ']'
+
+
+def _hyperscan_category(category) -> str:
+    try:
+        return _HYPERSCAN_CATEGORIES[category]
+    except KeyError:
+        raise ValueError(f"unsupported category {category}") from None
+
+
+# ``\Z`` is left out: Hyperscan also lets it match before a final newline.
+# So is ``\B``: before Python 3.14, ``re`` never matches it in empty text.
+_HYPERSCAN_ANCHORS = {
+    sre_parse.AT_BEGINNING: '^',
+    sre_parse.AT_BEGINNING_STRING: r'\A',
+    sre_parse.AT_END: '$',
+    sre_parse.AT_BOUNDARY: r'\b',
+}
+
+_HYPERSCAN_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: r'\d',
+    sre_parse.CATEGORY_NOT_DIGIT: r'\D',
+    sre_parse.CATEGORY_WORD: r'\w',
+    sre_parse.CATEGORY_NOT_WORD: r'\W',
+    sre_parse.CATEGORY_SPACE: r'\s',
+    sre_parse.CATEGORY_NOT_SPACE: r'\S',
+}
+
+
+class TriggerFilter:
+    """Cheap test for whether any of a set of patterns could match a text.
+
+    Pools the required literals (see ``required_literals``) of every
+    pattern. ASCII text that contains none of them cannot match any of the
+    patterns, so callers can skip scanning it altogether. Non-ASCII text
+    is only filtered when every pool holds for it (see
+    ``holds_for_unicode``), and everything passes when some pattern has no
+    required literals.
+    """
+
+    def __init__(self, patterns: List[Any]):
+        cased, caseless = set(), set()
+        self.always = False
+        self.unicode_safe = True
+        for pattern in patterns:
+            literals = required_literals(pattern)
+            if not literals:
+                self.always = True
+                break
+            ignore_case = bool(pattern.flags & re.IGNORECASE)
+            if not holds_for_unicode(literals, ignore_case):
+                self.unicode_safe = False
+            if ignore_case:
+                caseless.update(literals)
+            else:
+                cased.update(literals)
+        self.cased = tuple(cased)
+        self.caseless = tuple(caseless)
+
+    def may_match(self, text: str, lowered: Optional[str] = None) -> bool:
+        if self.always or not (self.unicode_safe or text.isascii()):
+            return True
+        if any(literal in text for literal in self.cased):
+            return True
+        if self.caseless:
+            if lowered is None:
+                lowered = text.lower()
+            return any(literal in lowered for literal in self.caseless)
+        return False
+
+
+class PatternScanner:
+    """Find which of a fixed set of compiled patterns occur in a text.
+
+    With the optional ``hyperscan`` package installed, input that
+    ``bytes_equivalent`` accepts is matched against every pattern in a single
+    pass of a block-mode database. Otherwise (for non-ASCII input, where
+    Hyperscan's word-boundary and case-folding rules differ from ``re``, and
+    for the ASCII separators its ``\\s`` leaves out) a combined ``re``
+    alternation is searched once and the individual patterns are only
+    consulted when it matches. Patterns that ``hyperscan_expression`` cannot
+    translate are always searched with ``re``.
+
+    On the ``re`` path, patterns whose required literals (see
+    ``required_literals``) are all absent from the text are ruled out with
+    plain substring checks before any regex runs. For non-ASCII text this
+    only applies to literals that ``holds_for_unicode`` accepts.
+    """
+
+    # Compiled state by pattern tuple, shared by all scanners over the same
+    # patterns. Building it, above all the Hyperscan database, is most of
+    # what a validator costs to construct.
+    _states = OrderedDict()
+    _MAX_STATES = 64
+
+    def __init__(self, patterns: List[Any]):
+        self.patterns = list(patterns)
+        self.combined, self._requirements, self._hs_db, self._hs_unsupported = self._state(self.patterns)
+        self._local = threading.local()
+
+    @classmethod
+    def _state(cls, patterns: List[Any]) -> tuple:
+        try:
+            key = tuple(patterns)
+            state = cls._states.get(key)
+        except TypeError:
+            return cls._compile(patterns)
+        if state is None:
+            state = cls._compile(patterns)
+            cls._states[key] = state
+            while len(cls._states) > cls._MAX_STATES:
+                try:
+                    cls._states.popitem(last=False)
+                except KeyError:
+                    break
+        return state
+
+    @classmethod
+    def _compile(cls, patterns: List[Any]) -> tuple:
+        combined = combine_patterns(patterns)
+        requirements = [cls._requirement(p) for p in patterns]
+        hs_db, hs_unsupported = None, []
+        if HYPERSCAN_AVAILABLE and patterns:
+            hs_db, hs_unsupported = cls._compile_hyperscan(patterns)
+        return combined, requirements, hs_db, hs_unsupported
+
+    def scan(self, text: str, data: Optional[bytes] = None, lowered: Optional[str] = None) -> Set[int]:
+        """Return the indices of all patterns that match somewhere in ``text``
+
+        ``data`` may carry ``text`` already encoded as UTF-8 and ``lowered``
+        its ``str.lower()``, so callers scanning one text with several
+        scanners only encode and lowercase it once. Without ``data`` the
+        shared ``encode`` memo is used.
+        """
+        if self._hs_db is not None and bytes_equivalent(text):
+            return self._scan_hyperscan(text, data if data is not None else encode(text))
+
+        candidates = self._literal_candidates(text, lowered)
+        if not candidates:
+            return set()
+        if self.combined is None or len(candidates) == 1:
+            return {i for i in candidates if self.patterns[i].search(text)}
+
+        match = self.combined.search(text)
+        if match is None:
+            return set()
+        # The outermost ``ruleN`` group closes last, so the combined match
+        # already names one pattern that occurs; only the rest need a search.
+        found = int(match.lastgroup[4:])
+        return {found} | {i for i in candidates if i != found and self.patterns[i].search(text)}
+
+    def candidates(self, text: str, data: Optional[bytes] = None, lowered: Optional[str] = None) -> Set[int]:
+        """Return the indices of patterns that may match somewhere in ``text``
+
+        Cheaper than ``scan`` on the ``re`` path: no regex is run, so the
+        result can contain patterns that turn out not to match. With
+        Hyperscan it is exact.
+        """
+        if self._hs_db is not None and bytes_equivalent(text):
+            return self._scan_hyperscan(text, data if data is not None else encode(text))
+        return self._literal_candidates(text, lowered)
+
+    @staticmethod
+    def _requirement(pattern: Any) -> Optional[tuple]:
+        literals = required_literals(pattern)
+        if not literals:
+            return None
+        ignore_case = bool(pattern.flags & re.IGNORECASE)
+        return tuple(literals), ignore_case, holds_for_unicode(literals, ignore_case)
+
+    def _literal_candidates(self, text: str, lowered: Optional[str] = None) -> Set[int]:
+        ascii_text = text.isascii()
+        candidates = set()
+        for i, requirement in enumerate(self._requirements):
+            if requirement is None or not (ascii_text or requirement[2]):
+                candidates.add(i)
+                continue
+            literals, ignore_case, _ = requirement
+            if ignore_case:
+                if lowered is None:
+                    lowered = text.lower()
+                haystack = lowered
+            else:
+                haystack = text
+            if any(literal in haystack for literal in literals):
+                candidates.add(i)
+        return candidates
+
+    @classmethod
+    def _compile_hyperscan(cls, patterns: List[Any]) -> tuple:
+        expressions, ids, flags, unsupported = [], [], [], []
+
+        for i, p in enumerate(patterns):
+            hs_flags = cls._hyperscan_flags(p)
+            expression = hyperscan_expression(p) if hs_flags is not None else None
+            if expression is None or not cls._hyperscan_supports(expression, hs_flags):
+                unsupported.append(i)
+                continue
+            expressions.append(expression)
+            ids.append(i)
+            flags.append(hs_flags)
+
+        if not expressions:
+            return None, unsupported
+
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(expressions=expressions, ids=ids, elements=len(expressions), flags=flags)
+        return db, unsupported
+
+    @staticmethod
+    def _hyperscan_flags(pattern: Any) -> Optional[int]:
+        if not isinstance(pattern, re.Pattern) or not isinstance(pattern.pattern, str):
+            return None
+        if pattern.flags & re.LOCALE:
+            return None
+
+        flags = hyperscan.HS_FLAG_SINGLEMATCH
+        if pattern.flags & re.IGNORECASE:
+            flags |= hyperscan.HS_FLAG_CASELESS
+        if pattern.flags & re.MULTILINE:
+            flags |= hyperscan.HS_FLAG_MULTILINE
+        if pattern.flags & re.DOTALL:
+            flags |= hyperscan.HS_FLAG_DOTALL
+        return flags
+
+    @staticmethod
+    def _hyperscan_supports(expression: bytes, flags: int) -> bool:
+        # Hyperscan rejects patterns that can match the empty string and
+        # repeats beyond its bounds; those stay on ``re``.
+        try:
+            probe = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            probe.compile(expressions=[expression], ids=[0], elements=1, flags=[flags])
+        except hyperscan.error:
+            return False
+        return True
+
+    def _scan_hyperscan(self, text: str, data: bytes) -> Set[int]:
+        # Scratch space must not be shared between concurrent scans.
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = hyperscan.Scratch(self._hs_db)
+            self._local.scratch = scratch
+
+        hits = set()
+        self._hs_db.scan(
+            data,
+            match_event_handler=_record_match,
+            context=hits,
+            scratch=scratch
+        )
+
+        for i in self._hs_unsupported:
+            if self.patterns[i].search(text):
+                hits.add(i)
+        return hits
+
+
+def _record_match(pattern_id, start, end, flags, hits):
+    hits.add(pattern_id)
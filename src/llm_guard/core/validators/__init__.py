@@ -1,11 +1,28 @@
 """Safety validators for different types of content"""
 
-from .toxicity import ToxicityValidator
-from .pii import PIIValidator
-from .prompt_injection import PromptInjectionValidator
+import importlib
 
 __all__ = [
     "ToxicityValidator",
     "PIIValidator",
     "PromptInjectionValidator",
 ]
+
+# Validator modules are only imported when first accessed
+_MODULES = {
+    "ToxicityValidator": ".toxicity",
+    "PIIValidator": ".pii",
+    "PromptInjectionValidator": ".prompt_injection",
+}
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        value = getattr(importlib.import_module(_MODULES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
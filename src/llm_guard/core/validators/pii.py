@@ -1,11 +1,13 @@
 # llm_guard/core/validators/pii.py
 
 import re
-from typing import Tuple, Dict, Any, List, Set
-from datetime import datetime
-import hashlib
+from typing import Tuple, Dict, Any, List, Optional, Set
+from collections import defaultdict
 
-class PIIValidator:
+from ..executor import BatchValidationMixin
+from ..scanner import PatternScanner, bytes_equivalent, encode
+
+class PIIValidator(BatchValidationMixin):
     """Detect and redact personally identifiable information (PII)"""
     
     def __init__(self):
@@ -108,6 +110,14 @@ class PIIValidator:
             'name', 'called', 'named', 'refer', 'i am', "i'm", 'my name',
             'contact', 'reach', 'ask for', 'speak to'
         }
+        self._name_context_re = re.compile('|'.join(map(re.escape, sorted(self.name_context_words))))
+        self._name_intro_re = re.compile(
+            r'\b(?:i am|i\'m|my name is|call me|this is)\s+[A-Z][a-z]+\b',
+            re.IGNORECASE
+        )
+        # Name indicators and the intro pattern are found in one scan; the
+        # intro comes last
+        self._name_scanner = PatternScanner(self.name_indicators + [self._name_intro_re])
         
         self.medical_patterns = {
             'medical_record': {
@@ -141,45 +151,107 @@ class PIIValidator:
             **self.medical_patterns,
             **self.financial_patterns
         }
+        
+        self._pattern_types = list(self.all_patterns)
+        self._scanner = PatternScanner([config['pattern'] for config in self.all_patterns.values()])
+        self._byte_patterns = {
+            pii_type: _bytes_pattern(config['pattern'])
+            for pii_type, config in self.all_patterns.items()
+        }
+        
+        # Context words of all types are looked up in one scan of the
+        # lowercased text. Words with capitals can never occur there.
+        self._context_types_by_word = defaultdict(set)
+        for pii_type, config in self.all_patterns.items():
+            for word in config.get('context_required', ()):
+                if word == word.lower():
+                    self._context_types_by_word[word].add(pii_type)
+        self._context_words = list(self._context_types_by_word)
+        self._context_scanner = PatternScanner([re.compile(re.escape(w)) for w in self._context_words])
+        
+        # Most recent (text, outcome), see validate
+        self._last = None
+    
+    def _candidate_types(self, text: str, text_lower: Optional[str] = None) -> Set[str]:
+        """PII types whose pattern may match ``text``, found in one pass"""
+        return {self._pattern_types[i] for i in self._scanner.candidates(text, lowered=text_lower)}
+    
+    def _matches(self, pii_type: str, text: str, data: Optional[bytes]) -> List[Tuple[Tuple[int, int], str]]:
+        """``(span, value)`` of every match of ``pii_type``'s pattern in ``text``
+        
+        ``data`` is ``text`` encoded when ``bytes_equivalent`` accepts it, or
+        None. Then the bytes form of the pattern runs over it instead: spans
+        and values come out the same, without ``re``'s Unicode handling.
+        """
+        pattern = self._byte_patterns.get(pii_type) if data is not None else None
+        if pattern is not None:
+            return [(match.span(), match.group().decode('ascii')) for match in pattern.finditer(data)]
+        return [(match.span(), match.group()) for match in self.all_patterns[pii_type]['pattern'].finditer(text)]
+    
+    def _context_types(self, text_lower: str) -> Set[str]:
+        """PII types whose required context occurs in ``text_lower``"""
+        types = set()
+        for i in self._context_scanner.scan(text_lower, lowered=text_lower):
+            types |= self._context_types_by_word[self._context_words[i]]
+        return types
     
     def validate(self, text: str) -> Tuple[float, Dict[str, Any]]:
+        """Score ``text``; the last outcome is reused for the same text again.
+        
+        The helpers below all start from ``validate``, so calling several
+        of them on one text only runs the patterns once.
+        """
+        last = self._last
+        if last is not None and (last[0] is text or last[0] == text):
+            return last[1]
+        
+        outcome = self._validate(text)
+        self._last = (text, outcome)
+        return outcome
+    
+    def _validate(self, text: str) -> Tuple[float, Dict[str, Any]]:
         found_pii = []
         total_risk = 0.0
         pii_counts = {}
+        text_lower = text.lower()
+        candidate_types = self._candidate_types(text, text_lower)
+        context_types = None
+        data = encode(text) if bytes_equivalent(text) else None
         
         for pii_type, config in self.all_patterns.items():
-            pattern = config['pattern']
-            matches = list(pattern.finditer(text))
+            if pii_type not in candidate_types:
+                continue
+            matches = self._matches(pii_type, text, data)
             
             if matches:
                 if 'context_required' in config:
-                    text_lower = text.lower()
-                    if not any(ctx in text_lower for ctx in config['context_required']):
+                    if context_types is None:
+                        context_types = self._context_types(text_lower)
+                    if pii_type not in context_types:
                         continue
                 
-                valid_matches = []
-                for match in matches:
-                    if 'validator' in config:
-                        if config['validator'](match.group()):
-                            valid_matches.append(match)
-                    else:
-                        valid_matches.append(match)
+                if 'validator' in config:
+                    check = config['validator']
+                    valid_matches = [match for match in matches if check(match[1])]
+                else:
+                    valid_matches = matches
                 
                 if valid_matches:
                     pii_counts[pii_type] = len(valid_matches)
                     risk_score = config['risk_score']
                     total_risk = max(total_risk, risk_score)
                     
-                    for match in valid_matches:
+                    # Only the first 10 items are reported; the rest are counted
+                    for span, value in valid_matches[:10 - len(found_pii)]:
                         found_pii.append({
                             'type': pii_type,
-                            'value': self._mask_value(match.group()),
-                            'position': match.span(),
+                            'value': self._mask_value(value),
+                            'position': span,
                             'risk_score': risk_score,
                             'description': config.get('description', pii_type)
                         })
         
-        name_score = self._detect_names(text)
+        name_score = self._detect_names(text, text_lower)
         if name_score > 0.5:
             total_risk = max(total_risk, 0.6)
             pii_counts['potential_names'] = 1
@@ -197,7 +269,7 @@ class PIIValidator:
         
         details = {
             'risk_score': total_risk,
-            'pii_found': found_pii[:10],
+            'pii_found': found_pii,
             'pii_counts': pii_counts,
             'total_pii_items': sum(pii_counts.values()),
             'reason': reason
@@ -206,20 +278,23 @@ class PIIValidator:
         return total_risk, details
     
     def redact(self, text: str, custom_labels: Dict[str, str] = None) -> str:
-        redacted_text = text
         replacements = []
+        text_lower = text.lower()
+        candidate_types = self._candidate_types(text, text_lower)
+        context_types = None
+        data = encode(text) if bytes_equivalent(text) else None
         
         for pii_type, config in self.all_patterns.items():
-            pattern = config['pattern']
-            
-            for match in pattern.finditer(text):
-                if 'context_required' in config:
-                    text_lower = text.lower()
-                    if not any(ctx in text_lower for ctx in config['context_required']):
-                        continue
-                
+            if pii_type not in candidate_types:
+                continue
+            if 'context_required' in config:
+                if context_types is None:
+                    context_types = self._context_types(text_lower)
+                if pii_type not in context_types:
+                    continue
+            for span, value in self._matches(pii_type, text, data):
                 if 'validator' in config:
-                    if not config['validator'](match.group()):
+                    if not config['validator'](value):
                         continue
                 
                 if custom_labels and pii_type in custom_labels:
@@ -227,77 +302,79 @@ class PIIValidator:
                 else:
                     label = config['redact_label']
                 
-                replacements.append((match.span(), label))
-        
-        replacements.sort(key=lambda x: x[0][0], reverse=True)
+                replacements.append((span, label))
         
-        for (start, end), label in replacements:
-            redacted_text = redacted_text[:start] + label + redacted_text[end:]
+        redacted_text = _splice_spans(text, replacements)
         
-        if self._detect_names(text) > 0.5:
+        if self._detect_names(text, text_lower) > 0.5:
             for pattern in self.name_indicators:
                 redacted_text = pattern.sub('[NAME]', redacted_text)
         
         return redacted_text
     
     def _validate_credit_card(self, number: str) -> bool:
-        number = re.sub(r'\D', '', number)
+        number = _NON_DIGIT.sub('', number)
         
         if len(number) < 13 or len(number) > 19:
             return False
         
-        digits = [int(d) for d in number]
-        checksum = 0
-        
-        for i in range(len(digits) - 2, -1, -2):
-            doubled = digits[i] * 2
-            if doubled > 9:
-                doubled = doubled - 9
-            digits[i] = doubled
-        
-        return sum(digits) % 10 == 0
+        return _luhn_valid(number)
     
-    def _detect_names(self, text: str) -> float:
+    def _detect_names(self, text: str, text_lower: Optional[str] = None) -> float:
         score = 0.0
+        found = self._name_scanner.scan(text, lowered=text_lower)
+        intro = len(self.name_indicators)
         
-        for pattern in self.name_indicators:
-            if pattern.search(text):
+        for index in range(intro):
+            if index in found:
                 score += 0.3
         
-        text_lower = text.lower()
-        for context_word in self.name_context_words:
-            if context_word in text_lower:
-                score += 0.2
-                break
+        if text_lower is None:
+            text_lower = text.lower()
+        if self._name_context_re.search(text_lower):
+            score += 0.2
         
-        name_intro_pattern = re.compile(
-            r'\b(?:i am|i\'m|my name is|call me|this is)\s+[A-Z][a-z]+\b',
-            re.IGNORECASE
-        )
-        if name_intro_pattern.search(text):
+        if intro in found:
             score += 0.4
         
         return min(1.0, score)
     
     def _mask_value(self, value: str) -> str:
-        if len(value) <= 4:
-            return '*' * len(value)
-        elif len(value) <= 8:
-            return value[:2] + '*' * (len(value) - 2)
+        n = len(value)
+        if n <= 4:
+            return _stars(n)
+        elif n <= 8:
+            return value[:2] + _stars(n - 2)
         else:
-            return value[:2] + '*' * (len(value) - 4) + value[-2:]
+            return value[:2] + _stars(n - 4) + value[-2:]
     
     def get_pii_types(self, text: str) -> List[str]:
         _, details = self.validate(text)
         return list(details['pii_counts'].keys())
     
     def has_high_risk_pii(self, text: str) -> bool:
-        _, details = self.validate(text)
+        # Only the high-risk types are checked, stopping at the first valid
+        # match, instead of building the full report
+        text_lower = text.lower()
+        candidate_types = self._candidate_types(text, text_lower)
+        context_types = None
+        data = encode(text) if bytes_equivalent(text) else None
         
-        high_risk_types = {'ssn', 'credit_card', 'passport', 'medical_record'}
-        found_types = set(details['pii_counts'].keys())
+        for pii_type in ('ssn', 'credit_card', 'passport', 'medical_record'):
+            config = self.all_patterns.get(pii_type)
+            if config is None or pii_type not in candidate_types:
+                continue
+            if 'context_required' in config:
+                if context_types is None:
+                    context_types = self._context_types(text_lower)
+                if pii_type not in context_types:
+                    continue
+            check = config.get('validator')
+            for _, value in self._matches(pii_type, text, data):
+                if check is None or check(value):
+                    return True
         
-        return bool(found_types & high_risk_types)
+        return False
     
     def generate_pii_report(self, text: str) -> str:
         risk_score, details = self.validate(text)
@@ -319,3 +396,78 @@ class PIIValidator:
             report.append("\n⚠️  MODERATE RISK: This text contains sensitive information")
         
         return "\n".join(report)
+
+
+def _bytes_pattern(pattern: Any) -> Optional[re.Pattern]:
+    """``pattern`` compiled for bytes, or None if it has no bytes equivalent.
+    
+    On input that ``bytes_equivalent`` accepts, a bytes pattern finds the
+    same spans as the original.
+    """
+    if not isinstance(pattern, re.Pattern) or not isinstance(pattern.pattern, str):
+        return None
+    try:
+        return re.compile(pattern.pattern.encode('ascii'), pattern.flags & ~re.UNICODE)
+    except (UnicodeEncodeError, re.error):
+        return None
+
+
+_NON_DIGIT = re.compile(r'\D')
+
+_STARS = tuple('*' * n for n in range(64))
+
+
+def _stars(n: int) -> str:
+    return _STARS[n] if n < 64 else '*' * n
+
+# Byte masks over the 20 nibbles a 19-digit number occupies once read as hex
+_LUHN_LOW = int('0f' * 10, 16)
+_LUHN_HIGH = int('f0' * 10, 16)
+_LUHN_THREES = int('03' * 10, 16)
+_LUHN_EIGHTS = int('08' * 10, 16)
+
+
+def _luhn_valid(number: str) -> bool:
+    """Luhn checksum of a string of at most 19 digits, without a digit loop.
+    
+    Parsed as hex, each digit lands in its own nibble, the check digit
+    lowest. Every second digit from the right sits in a high nibble; shifted
+    down, each gets a byte to itself, where doubling it cannot carry over.
+    Adding 3 sets bit 3 exactly for digits 5-9, the ones whose doubled value
+    loses 9. Every byte then holds at most 18 and their sum at most 180, so
+    the sum of bytes is simply the value modulo 255.
+    """
+    value = int(number, 16)
+    kept = value & _LUHN_LOW
+    doubled = (value & _LUHN_HIGH) >> 4
+    over = ((doubled + _LUHN_THREES) & _LUHN_EIGHTS) >> 3
+    return (kept + 2 * doubled - 9 * over) % 255 % 10 == 0
+
+
+def _splice_spans(text: str, replacements: List[Tuple[Tuple[int, int], str]]) -> str:
+    """Replace each ``((start, end), label)`` span of ``text`` in a single pass.
+    
+    Overlapping spans are merged into one; the span starting first (the
+    longest one on ties) provides the label.
+    """
+    if not replacements:
+        return text
+    
+    ordered = sorted(
+        enumerate(replacements),
+        key=lambda item: (item[1][0][0], -item[1][0][1], item[0])
+    )
+    
+    pieces = []
+    cursor = 0
+    for _, ((start, end), label) in ordered:
+        if start < cursor:
+            if end > cursor:
+                cursor = end
+            continue
+        pieces.append(text[cursor:start])
+        pieces.append(label)
+        cursor = end
+    pieces.append(text[cursor:])
+    
+    return ''.join(pieces)
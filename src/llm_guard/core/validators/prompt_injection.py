@@ -4,7 +4,16 @@ import re
 from typing import Tuple, Dict, Any, List
 from collections import defaultdict
 
-class PromptInjectionValidator:
+from ..executor import BatchValidationMixin
+from ..scanner import PatternScanner, TriggerFilter
+
+# Risk scores validate() gives outside the injection techniques; the
+# detect_jailbreak short-circuit relies on them too
+_KNOWN_JAILBREAK_RISK = 0.95
+_SUSPICIOUS_TOKENS_RISK = 0.7
+
+
+class PromptInjectionValidator(BatchValidationMixin):
     """Detect prompt injection and jailbreak attempts"""
     
     def __init__(self):
@@ -55,45 +64,83 @@ class PromptInjectionValidator:
         self.suspicious_tokens = {
             'SYSTEM:', 'USER:', 'ASSISTANT:', '###', '```', '[INST]', '[/INST]'
         }
+        
+        self.jailbreak_signatures = [
+            (re.compile(r'(do\s+anything\s+now|dan\s+mode|developer\s+mode)'), 0.95, "DAN-style"),
+            (re.compile(r'(you\s+are\s+now|pretend\s+you\s+are).*(no\s+restrictions|unlimited)'), 0.9, "Role-play manipulation"),
+            (re.compile(r'ignore\s+all\s+previous.*instructions'), 0.9, "Instruction override"),
+        ]
+        
+        self._scanners = {
+            technique: PatternScanner([re.compile(p) for p in config['patterns']])
+            for technique, config in self.injection_techniques.items()
+        }
+        self._triggers = TriggerFilter([
+            pattern for scanner in self._scanners.values() for pattern in scanner.patterns
+        ])
+        # Keyword lists are matched as escaped literals, one pass per list
+        self._jailbreak_scanner = PatternScanner([re.compile(re.escape(j)) for j in self.known_jailbreaks])
+        self._suspicious_tokens = [token.lower() for token in self.suspicious_tokens]
+        self._token_scanner = PatternScanner([re.compile(re.escape(t)) for t in self._suspicious_tokens])
+        
+        # Most recent (text, outcome), see validate
+        self._last = None
     
     def validate(self, text: str) -> Tuple[float, Dict[str, Any]]:
+        """Score ``text``; the last outcome is reused for the same text again.
+        
+        The helpers below all start from ``validate``, so calling several
+        of them on one text only runs the patterns once.
+        """
+        last = self._last
+        if last is not None and (last[0] is text or last[0] == text):
+            return last[1]
+        
+        outcome = self._validate(text)
+        self._last = (text, outcome)
+        return outcome
+    
+    def _validate(self, text: str) -> Tuple[float, Dict[str, Any]]:
         text_lower = text.lower()
         
         detections = defaultdict(list)
         max_score = 0.0
         total_patterns_matched = 0
         
-        for technique, config in self.injection_techniques.items():
+        if self._triggers.may_match(text_lower, text_lower):
+            techniques = self.injection_techniques.items()
+        else:
+            techniques = ()
+        
+        for technique, config in techniques:
             technique_score = 0.0
             
-            for pattern in config['patterns']:
-                if re.search(pattern, text_lower):
-                    technique_score = config['risk_score']
-                    total_patterns_matched += 1
-                    detections[technique].append({
-                        'pattern': pattern,
-                        'risk_score': config['risk_score']
-                    })
+            for index in sorted(self._scanners[technique].scan(text_lower, lowered=text_lower)):
+                technique_score = config['risk_score']
+                total_patterns_matched += 1
+                detections[technique].append({
+                    'pattern': config['patterns'][index],
+                    'risk_score': config['risk_score']
+                })
             
             if technique_score > 0:
                 max_score = max(max_score, technique_score)
         
         jailbreak_found = False
-        for jailbreak in self.known_jailbreaks:
-            if jailbreak in text_lower:
-                jailbreak_found = True
-                max_score = max(max_score, 0.95)
-                detections['known_jailbreak'].append({
-                    'jailbreak': jailbreak,
-                    'risk_score': 0.95
-                })
+        for index in sorted(self._jailbreak_scanner.scan(text_lower, lowered=text_lower)):
+            jailbreak_found = True
+            max_score = max(max_score, _KNOWN_JAILBREAK_RISK)
+            detections['known_jailbreak'].append({
+                'jailbreak': self.known_jailbreaks[index],
+                'risk_score': _KNOWN_JAILBREAK_RISK
+            })
         
-        suspicious_count = sum(1 for token in self.suspicious_tokens if token.lower() in text_lower)
+        suspicious_count = len(self._token_scanner.scan(text_lower, lowered=text_lower))
         if suspicious_count >= 3:
-            max_score = max(max_score, 0.7)
+            max_score = max(max_score, _SUSPICIOUS_TOKENS_RISK)
             detections['suspicious_tokens'].append({
                 'count': suspicious_count,
-                'risk_score': 0.7
+                'risk_score': _SUSPICIOUS_TOKENS_RISK
             })
         
         final_score = max_score
@@ -121,26 +168,32 @@ class PromptInjectionValidator:
         return final_score, details
     
     def detect_jailbreak(self, text: str) -> Tuple[bool, float, str]:
-        score, details = self.validate(text)
-        
         jailbreak_score = 0.0
         technique = "unknown"
         
-        if re.search(r'(do\s+anything\s+now|dan\s+mode|developer\s+mode)', text.lower()):
-            jailbreak_score = 0.95
-            technique = "DAN-style"
-        elif re.search(r'(you\s+are\s+now|pretend\s+you\s+are).*(no\s+restrictions|unlimited)', text.lower()):
-            jailbreak_score = 0.9
-            technique = "Role-play manipulation"
-        elif re.search(r'ignore\s+all\s+previous.*instructions', text.lower()):
-            jailbreak_score = 0.9
-            technique = "Instruction override"
+        text_lower = text.lower()
+        for pattern, signature_score, signature_technique in self.jailbreak_signatures:
+            if pattern.search(text_lower):
+                jailbreak_score = signature_score
+                technique = signature_technique
+                break
+        
+        # validate() cannot score above its highest risk score, so a
+        # signature at least that high settles the result on its own
+        if jailbreak_score >= self._max_risk_score():
+            score = 0.0
+        else:
+            score, _ = self.validate(text)
         
         final_score = max(score, jailbreak_score)
         is_jailbreak = final_score > 0.8
         
         return is_jailbreak, final_score, technique
     
+    def _max_risk_score(self) -> float:
+        technique_scores = [config['risk_score'] for config in self.injection_techniques.values()]
+        return max(technique_scores + [_KNOWN_JAILBREAK_RISK, _SUSPICIOUS_TOKENS_RISK])
+    
     def explain(self, text: str) -> str:
         score, details = self.validate(text)
         
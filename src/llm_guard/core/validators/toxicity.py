@@ -1,13 +1,17 @@
 # llm_guard/core/validators/toxicity.py
 
 import re
-import json
 from typing import Tuple, Dict, Any, List
-from pathlib import Path
-import numpy as np
 from collections import defaultdict
 
-class ToxicityValidator:
+from ..executor import BatchValidationMixin
+from ..scanner import PatternScanner
+
+_ZERO_WIDTH = dict.fromkeys(map(ord, '\u200b\u200c\u200d\ufeff'))
+_PUNCT_SPACING = re.compile(r'\s*([,.!?;:])\s*')
+
+
+class ToxicityValidator(BatchValidationMixin):
     """Lightweight toxicity detection using pattern matching and heuristics"""
     
     def __init__(self):
@@ -48,7 +52,30 @@ class ToxicityValidator:
             (r'[!?]{3,}', 0.1),
         ]
         
+        # Every category's patterns go into one scanner, so a text is
+        # scanned once rather than once per category. Entries are in
+        # category order, which sorted scanner indices preserve.
+        self._entries = [
+            (category, pattern, base_score * config['weight'])
+            for category, config in self.categories.items()
+            for pattern, base_score in config['patterns']
+        ]
+        self._scanner = PatternScanner([pattern for _, pattern, _ in self._entries])
+        
+        # Context and intensity modifiers share one scan of the raw text
+        self._modifiers = [
+            (re.compile(pattern, re.IGNORECASE), modifier, 'context')
+            for pattern, modifier in self.context_modifiers
+        ] + [
+            (re.compile(pattern), modifier, 'intensity')
+            for pattern, modifier in self.intensity_modifiers
+        ]
+        self._modifier_scanner = PatternScanner([pattern for pattern, _, _ in self._modifiers])
+        
         self._init_context_features()
+        
+        # Most recent (text, outcome), see validate
+        self._last = None
     
     def _load_profanity_patterns(self) -> List[Tuple[re.Pattern, float]]:
         patterns = []
@@ -154,56 +181,74 @@ class ToxicityValidator:
             'story', 'novel', 'fiction', 'character', 'plot',
             'movie', 'book', 'scene', 'dialogue', 'narrative'
         }
+        
+        # Match whole whitespace-delimited words, as str.split() would
+        self._academic_re = _word_set_pattern(self.academic_contexts)
+        self._fictional_re = _word_set_pattern(self.fictional_contexts)
     
     def validate(self, text: str) -> Tuple[float, Dict[str, Any]]:
+        """Score ``text``; the last outcome is reused for the same text again.
+        
+        The helpers below all start from ``validate``, so calling several
+        of them on one text only runs the patterns once.
+        """
+        last = self._last
+        if last is not None and (last[0] is text or last[0] == text):
+            return last[1]
+        
+        outcome = self._validate(text)
+        self._last = (text, outcome)
+        return outcome
+    
+    def _validate(self, text: str) -> Tuple[float, Dict[str, Any]]:
         processed_text = self._preprocess(text)
         
+        # Scoring only needs each category's maximum, but details['categories']
+        # has always listed every matched score per category, and callers of
+        # validate() and SafetyGuard.analyze() read that shape, so both are kept.
         category_scores = defaultdict(list)
+        category_maxes = {}
         matches = []
         
-        for category, config in self.categories.items():
-            for pattern, base_score in config['patterns']:
-                if pattern.search(processed_text):
-                    weighted_score = base_score * config['weight']
-                    category_scores[category].append(weighted_score)
-                    matches.append({
-                        'category': category,
-                        'score': weighted_score,
-                        'pattern': pattern.pattern
-                    })
-        
-        if matches:
-            category_maxes = []
-            for category, scores in category_scores.items():
-                if scores:
-                    category_maxes.append(max(scores))
-            
-            base_score = np.mean(category_maxes) if category_maxes else 0.0
+        for index in sorted(self._scanner.scan(processed_text)):
+            category, pattern, weighted_score = self._entries[index]
+            category_scores[category].append(weighted_score)
+            if weighted_score > category_maxes.get(category, -1.0):
+                category_maxes[category] = weighted_score
+            # Only the first few matches are reported
+            if len(matches) < 5:
+                matches.append({
+                    'category': category,
+                    'score': weighted_score,
+                    'pattern': pattern.pattern
+                })
+        
+        if category_maxes:
+            base_score = sum(category_maxes.values()) / len(category_maxes)
         else:
             base_score = 0.0
         
+        text_lower = text.lower()
         context_modifier = 0.0
-        for pattern, modifier in self.context_modifiers:
-            if re.search(pattern, text, re.IGNORECASE):
-                context_modifier += modifier
-        
         intensity_modifier = 0.0
-        for pattern, modifier in self.intensity_modifiers:
-            if re.search(pattern, text):
+        for index in sorted(self._modifier_scanner.scan(text, lowered=text_lower)):
+            _, modifier, kind = self._modifiers[index]
+            if kind == 'context':
+                context_modifier += modifier
+            else:
                 intensity_modifier += modifier
         
-        words = set(text.lower().split())
-        if words & self.academic_contexts:
+        if self._academic_re.search(text_lower):
             context_modifier -= 0.2
-        if words & self.fictional_contexts:
+        if self._fictional_re.search(text_lower):
             context_modifier -= 0.15
         
         final_score = max(0.0, min(1.0, base_score + context_modifier + intensity_modifier))
         
         reason = None
         if final_score > 0.5:
-            if category_scores:
-                top_category = max(category_scores.items(), key=lambda x: max(x[1]) if x[1] else 0)[0]
+            if category_maxes:
+                top_category = max(category_maxes, key=category_maxes.get)
                 reason = f"{top_category.replace('_', ' ').title()} detected"
             else:
                 reason = "Potentially toxic content detected"
@@ -214,7 +259,7 @@ class ToxicityValidator:
             'context_modifier': context_modifier,
             'intensity_modifier': intensity_modifier,
             'categories': dict(category_scores),
-            'matches': matches[:5],
+            'matches': matches,
             'reason': reason
         }
         
@@ -222,8 +267,8 @@ class ToxicityValidator:
     
     def _preprocess(self, text: str) -> str:
         text = ' '.join(text.split())
-        text = re.sub(r'[\u200b\u200c\u200d\ufeff]', '', text)
-        text = re.sub(r'\s*([,.!?;:])\s*', r'\1 ', text)
+        text = text.translate(_ZERO_WIDTH)
+        text = _PUNCT_SPACING.sub(r'\1 ', text)
         return text
     
     def explain(self, text: str) -> str:
@@ -247,3 +292,9 @@ class ToxicityValidator:
             category_scores[category] = max(scores) if scores else 0.0
         
         return category_scores
+
+
+def _word_set_pattern(words) -> re.Pattern:
+    """Pattern matching any of ``words`` as a whole whitespace-delimited token"""
+    alternatives = '|'.join(map(re.escape, sorted(words, key=len, reverse=True)))
+    return re.compile(rf'(?<!\S)(?:{alternatives})(?!\S)')
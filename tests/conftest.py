@@ -0,0 +1,26 @@
+import os
+import sys
+from collections import OrderedDict
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+from llm_guard.core import scanner  # noqa: E402
+
+
+@pytest.fixture(params=['re', 'hyperscan'])
+def backend(request, monkeypatch):
+    """Run a test once per scanning backend.
+
+    Scanners built inside the test use Hyperscan only for the
+    ``hyperscan`` run, which is skipped when the package is missing.
+    """
+    if request.param == 'hyperscan':
+        if not scanner.HYPERSCAN_AVAILABLE:
+            pytest.skip('hyperscan is not installed')
+    else:
+        monkeypatch.setattr(scanner, 'HYPERSCAN_AVAILABLE', False)
+    # Compiled state is shared between scanners; start from a clean slate
+    monkeypatch.setattr(scanner.PatternScanner, '_states', OrderedDict())
+    return request.param
@@ -0,0 +1,65 @@
+from llm_guard.core.validators.pii import PIIValidator
+
+
+def test_card_with_separators(backend):
+    validator = PIIValidator()
+    text = 'card 4111\x1f1111\x1f1111\x1f1111'
+    score, details = validator.validate(text)
+    assert score == 1.0
+    assert 'credit_card' in details['pii_counts']
+    assert validator.has_high_risk_pii(text)
+    assert validator.redact(text) == 'card [CREDIT_CARD]'
+
+
+def test_address_with_separators(backend):
+    validator = PIIValidator()
+    text = 'I live at 123\x1fMain\x1fStreet'
+    score, details = validator.validate(text)
+    assert score == 0.7
+    assert 'address' in details['pii_counts']
+    assert validator.redact(text) == 'I live at [ADDRESS]'
+
+
+def test_ascii_matches_unchanged(backend):
+    validator = PIIValidator()
+    score, details = validator.validate('Call 555-123-4567 or mail jane@example.com')
+    assert set(details['pii_counts']) == {'phone', 'email'}
+    assert validator.redact('SSN 123-45-6789') == 'SSN [SSN]'
+
+
+def test_candidate_types_cover_matches(backend):
+    validator = PIIValidator()
+    texts = [
+        'card 4111\x1f1111\x1f1111\x1f1111',
+        'I live at 123\x1fMain\x1fStreet',
+        'card 4111 1111 1111 1111',
+        'I live at 123 Main Street',
+        'MRN\x1c12345678 and Policy\x1d#ABC123456',
+        'DOB:\x1e01/02/1990, café ٤١١١',
+    ]
+    for text in texts:
+        matching = {
+            pii_type for pii_type, config in validator.all_patterns.items()
+            if config['pattern'].search(text)
+        }
+        assert matching <= validator._candidate_types(text)
+
+
+def test_names_with_separators(backend):
+    validator = PIIValidator()
+    score, details = validator.validate('My name is\x1fJohn and call me\x1fBob')
+    assert score == 0.6
+    assert details['pii_counts'] == {'potential_names': 1}
+
+
+def test_validate_batch_on_shared_pool(backend):
+    from llm_guard.core.executor import get_executor
+
+    validator = PIIValidator()
+    texts = ['SSN 123-45-6789', 'nothing here', 'mail jane@example.com', 'call 555-123-4567', 'x']
+    expected = [PIIValidator().validate(text) for text in texts]
+    assert validator.validate_batch(texts) == expected
+    assert validator.validate_batch(texts, max_workers=2) == expected
+    assert validator.validate_batch(texts, max_workers=10) == expected
+    # From a pool thread the batch runs in line instead of waiting on the pool
+    assert get_executor().submit(validator.validate_batch, texts, 4).result(timeout=10) == expected